@@ -9,6 +9,7 @@ import mkn10
 import pricing
 import report_generator
 import theme
+import toxicology
 
 ANAM_SECTIONS = ["OA", "RA", "PA", "SA", "FA", "AA", "EA", "NO"]
 # default texts for anamnesis sections if left empty by the user
@@ -34,12 +35,14 @@ SUGGESTION_RULES = [
 ]
 
 DATA_PATH = Path(__file__).resolve().parent / "data" / "diagnosis_children.json"
+TOX_DATA_PATH = Path(__file__).resolve().parent / "data" / "toxicology.json"
 
 
 class ReportGenerator(QtWidgets.QTabWidget):
     def __init__(self) -> None:
         super().__init__()
         mkn10.load_mkn10_data(str(DATA_PATH))
+        toxicology.load_toxicology_data(str(TOX_DATA_PATH))
 
         self.setWindowTitle("Generátor lékařské zprávy - Doctor-11")
         self.setMinimumSize(600, 700)
@@ -473,30 +476,12 @@ class ReportGenerator(QtWidgets.QTabWidget):
         self.gcs_total_label.setText(str(total))
 
     def update_toxicology_interpretation(self) -> None:
-        substance = self.tox_substance.currentText().lower()
-        symptoms = self.tox_symptoms.toPlainText().lower()
-        dose_text = self.tox_dose.text().replace(",", ".")
-        dose_val = None
-        try:
-            dose_val = float("".join(ch for ch in dose_text if ch.isdigit() or ch == "."))
-        except ValueError:
-            pass
-
-        msgs: list[str] = []
-        therapy: list[str] = []
-        if "opioid" in substance and ("mioz" in symptoms or "poruch" in symptoms):
-            msgs.append("Podezření na opioidní intoxikaci – zvážit podání Naloxonu")
-            therapy.append("Naloxon")
-        if "alkohol" in substance and dose_val is not None and dose_val > 3:
-            msgs.append("Závažná etanolová intoxikace – monitorace, glukóza, thiamin, hydratace")
-            therapy.append("monitorace, glukóza, thiamin, hydratace")
-        if "co" == substance or substance.startswith("co "):
-            msgs.append("Zvážit hyperbarickou komoru, 100% kyslík")
-            therapy.append("hyperbarická komora, 100% kyslík")
-
-        base = ["výplach žaludku (do 1h)", "aktivní uhlí 1g/kg", "antidota (naloxon, flumazenil, NAC...)"]
-        therapy.extend(base)
-
+        msgs, therapy = toxicology.evaluate(
+            self.tox_substance.currentText(),
+            self.tox_dose.text(),
+            self.tox_time.text(),
+            self.tox_symptoms.toPlainText(),
+        )
         self.tox_interpret_label.setText("; ".join(msgs))
         self.current_tox_therapy = "\n".join(therapy)
         self.tox_therapy_label.setText(self.current_tox_therapy)
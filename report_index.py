@@ -0,0 +1,277 @@
+"""Incremental indexer for archives of exported TXT reports.
+
+Reports are parsed from the header written by ``report_generator.generate_report``
+(document title, tags and price lines). The index is stored as a columnar JSON
+file next to the archive; string columns are dictionary encoded so aggregate
+queries are simple counts over integer lists. Files already indexed are only
+re-parsed when their mtime or size changes.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pricing
+
+INDEX_NAME = ".report_index.json"
+INDEX_VERSION = 2
+# header lines live at the very start of the report, no need to map more
+HEADER_BYTES = 4096
+# below this many changed files the process pool costs more than it saves
+PARALLEL_THRESHOLD = 64
+
+TITLE_RE = re.compile(rb"^\xf0\x9f\x97\x82 N\xc3\xa1zev dokumentu: .*? MKN-10: (\S*) ", re.M)
+TAGS_RE = re.compile(rb"^\xf0\x9f\x8f\xb7\xef\xb8\x8f Tagy: ?(.*)$", re.M)
+PRICE_RE = re.compile(rb"^\xf0\x9f\x92\xb0 Cena za v\xc3\xbdkon: (\d+) K\xc4\x8d", re.M)
+
+# tag form of the locality (see ReportGenerator.generate_tags) -> locality name
+LOCALITY_TAGS = {name.replace(" ", "").lower(): name for name in pricing.LOCALITY_PRICES}
+
+STRING_COLUMNS = ("mkn", "locality", "month")
+INT_COLUMNS = ("price", "mtime_ns", "size")
+
+
+def parse_report(path: str) -> tuple[str, str, int] | None:
+    """Return ``(mkn, locality, price)`` parsed from report header or ``None``."""
+    try:
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if not size:
+                return None
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                head = mm[:HEADER_BYTES]
+    except (OSError, ValueError):
+        return None
+
+    title = TITLE_RE.search(head)
+    if not title:
+        return None
+    mkn = title.group(1).decode("utf-8", "replace").upper()
+
+    locality = ""
+    tags = TAGS_RE.search(head)
+    if tags:
+        parts = tags.group(1).decode("utf-8", "replace").split()
+        if parts:
+            tag = parts[-1].lstrip("#")
+            locality = LOCALITY_TAGS.get(tag, tag)
+
+    price_match = PRICE_RE.search(head)
+    price = int(price_match.group(1)) if price_match else 0
+    return mkn, locality, price
+
+
+def scan_archive(root: Path) -> dict[str, tuple[int, int]]:
+    """Return ``{relative path: (mtime_ns, size)}`` for all TXT files under root."""
+    found: dict[str, tuple[int, int]] = {}
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.lower().endswith(".txt") and entry.is_file():
+                    st = entry.stat()
+                    found[os.path.relpath(entry.path, root)] = (st.st_mtime_ns, st.st_size)
+    return found
+
+
+class ReportIndex:
+    """Columnar store of parsed reports with incremental refresh."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.index_path = self.root / INDEX_NAME
+        self.paths: list[str] = []
+        self.columns: dict[str, list[int]] = {name: [] for name in STRING_COLUMNS + INT_COLUMNS}
+        self.vocab: dict[str, list[str]] = {name: [] for name in STRING_COLUMNS}
+        self._codes: dict[str, dict[str, int]] = {name: {} for name in STRING_COLUMNS}
+        self._rows: dict[str, int] = {}
+        # TXT files that are not reports -> [mtime_ns, size], skipped until they change
+        self.skipped: dict[str, list[int]] = {}
+        # set by update() when the index differs from the saved file
+        self.dirty = False
+
+    # -------------------- persistence --------------------
+    def load(self) -> ReportIndex:
+        """Load previously saved index, starting empty if missing or outdated."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            return self
+        if data.get("version") != INDEX_VERSION:
+            return self
+        self.paths = data["paths"]
+        self.columns = data["columns"]
+        self.vocab = data["vocab"]
+        self._codes = {name: {v: i for i, v in enumerate(vals)} for name, vals in self.vocab.items()}
+        self.skipped = data["skipped"]
+        self._rows = {p: i for i, p in enumerate(self.paths)}
+        return self
+
+    def save(self) -> None:
+        """Write index atomically next to the archive."""
+        self.dirty = False
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "paths": self.paths,
+                    "columns": self.columns,
+                    "vocab": self.vocab,
+                    "skipped": self.skipped,
+                },
+                fh,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, self.index_path)
+
+    # -------------------- indexing --------------------
+    def _encode(self, column: str, value: str) -> int:
+        codes = self._codes[column]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self.vocab[column])
+            self.vocab[column].append(value)
+        return code
+
+    def _set_row(self, row: int, parsed: tuple[str, str, int], mtime_ns: int, size: int) -> None:
+        mkn, locality, price = parsed
+        month = time.strftime("%Y-%m", time.localtime(mtime_ns / 1e9))
+        values = {
+            "mkn": self._encode("mkn", mkn),
+            "locality": self._encode("locality", locality),
+            "month": self._encode("month", month),
+            "price": price,
+            "mtime_ns": mtime_ns,
+            "size": size,
+        }
+        for name, value in values.items():
+            self.columns[name][row] = value
+
+    def _drop_rows(self, removed: set[int]) -> None:
+        keep = [i for i in range(len(self.paths)) if i not in removed]
+        self.paths = [self.paths[i] for i in keep]
+        for name, col in self.columns.items():
+            self.columns[name] = [col[i] for i in keep]
+        self._rows = {p: i for i, p in enumerate(self.paths)}
+
+    def update(self, workers: int | None = None) -> dict[str, int]:
+        """Sync index with the archive and return counts of added/changed/removed files.
+
+        Only files whose mtime or size differ from the stored values are parsed;
+        larger batches are spread over a process pool.
+        """
+        current = scan_archive(self.root)
+        mtimes = self.columns["mtime_ns"]
+        sizes = self.columns["size"]
+
+        todo: list[str] = []
+        for path, stat in current.items():
+            row = self._rows.get(path)
+            if row is not None:
+                if (mtimes[row], sizes[row]) != stat:
+                    todo.append(path)
+            elif tuple(self.skipped.get(path, ())) != stat:
+                todo.append(path)
+
+        removed = {row for path, row in self._rows.items() if path not in current}
+        skipped_before = len(self.skipped)
+        self.skipped = {p: st for p, st in self.skipped.items() if p in current}
+        # every parsed path ends up as a new/updated row or a new skipped entry
+        self.dirty = self.dirty or bool(todo or removed) or len(self.skipped) != skipped_before
+
+        full_paths = [str(self.root / p) for p in todo]
+        if len(todo) >= PARALLEL_THRESHOLD and workers != 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(parse_report, full_paths, chunksize=256))
+        else:
+            results = [parse_report(p) for p in full_paths]
+
+        added = changed = 0
+        for path, parsed in zip(todo, results):
+            row = self._rows.get(path)
+            if parsed is None:
+                # unreadable or not a report - forget any older version of it
+                self.skipped[path] = list(current[path])
+                if row is not None:
+                    removed.add(row)
+                continue
+            self.skipped.pop(path, None)
+            if row is None:
+                added += 1
+                row = self._rows[path] = len(self.paths)
+                self.paths.append(path)
+                for col in self.columns.values():
+                    col.append(0)
+            else:
+                changed += 1
+            self._set_row(row, parsed, *current[path])
+
+        if removed:
+            self._drop_rows(removed)
+        return {"added": added, "changed": changed, "removed": len(removed)}
+
+    # -------------------- queries --------------------
+    def count_by(self, column: str) -> dict[str, int]:
+        """Return number of reports per value of ``mkn``, ``locality`` or ``month``."""
+        vocab = self.vocab[column]
+        counts = Counter(self.columns[column])
+        return {vocab[code]: n for code, n in counts.most_common()}
+
+    def revenue_by(self, column: str) -> dict[str, int]:
+        """Return sum of prices per value of ``mkn``, ``locality`` or ``month``."""
+        vocab = self.vocab[column]
+        totals = [0] * len(vocab)
+        for code, price in zip(self.columns[column], self.columns["price"]):
+            totals[code] += price
+        return {vocab[code]: total for code, total in enumerate(totals) if total}
+
+    def total_revenue(self) -> int:
+        """Return sum of prices of all indexed reports."""
+        return sum(self.columns["price"])
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 2:
+        print(f"Použití: {argv[0]} ADRESÁŘ [mkn|locality|month]")
+        return 1
+    if len(argv) > 2 and argv[2] not in STRING_COLUMNS:
+        print(f"Použití: {argv[0]} ADRESÁŘ [mkn|locality|month]")
+        return 1
+    index = ReportIndex(argv[1]).load()
+    stats = index.update()
+    if index.dirty:
+        index.save()
+    print(
+        f"Zpráv: {len(index)} (nové {stats['added']}, změněné {stats['changed']}, "
+        f"odstraněné {stats['removed']})"
+    )
+    print(f"Celkové tržby: {index.total_revenue()} Kč")
+    if len(argv) > 2:
+        column = argv[2]
+        revenue = index.revenue_by(column)
+        for value, count in index.count_by(column).items():
+            print(f"{value or '-'}: {count} ({revenue.get(value, 0)} Kč)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,177 @@
+import csv
+import json
+import re
+import sys
+from datetime import datetime
+
+# substance -> list of compiled rules
+_substances: dict[str, list[dict]] = {}
+# normalized synonym (lowercase words joined by a space) -> substance
+_synonyms: dict[str, str] = {}
+# word count of the longest synonym, bounds the n-grams looked up
+_max_words = 1
+_base_therapy: tuple[dict, ...] = ()
+
+DOSE_RE = re.compile(r"\d+(?:\.\d+)?")
+TIME_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*$")
+WORD_RE = re.compile(r"\w+")
+# separators of a list of substances, e.g. "alkohol + opioid"
+ITEM_SPLIT_RE = re.compile(r"[+,/;]")
+# shorter synonyms (e.g. "co", also Czech "what") only match as the first word of the field
+# or of a list item; longer ones also match as word stems, e.g. "opioidní"
+MIN_STEM_LENGTH = 4
+# exposure times up to this many minutes ahead are treated as typos or clock skew, not as yesterday
+FUTURE_TOLERANCE_MINUTES = 60
+
+
+def _compile_rule(rule: dict) -> dict:
+    keywords = rule.get("symptoms") or []
+    return {
+        "matcher": re.compile("|".join(re.escape(k.lower()) for k in keywords)) if keywords else None,
+        "dose_above": rule.get("dose_above"),
+        "min_hours": rule.get("min_hours"),
+        "max_hours": rule.get("max_hours"),
+        "message": rule.get("message", ""),
+        "therapy": rule.get("therapy", ""),
+    }
+
+
+def load_toxicology_data(path: str) -> dict:
+    """Load toxicology rule base from JSON file."""
+    global _substances, _synonyms, _max_words, _base_therapy
+    with open(path, "r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    _substances = {}
+    _synonyms = {}
+    for name, item in data.get("substances", {}).items():
+        key = name.lower()
+        _substances[key] = [_compile_rule(r) for r in item.get("rules", [])]
+        for synonym in [name, *item.get("synonyms", [])]:
+            words = WORD_RE.findall(synonym.lower())
+            if words:
+                _synonyms[" ".join(words)] = key
+    _max_words = max((syn.count(" ") + 1 for syn in _synonyms), default=1)
+    _base_therapy = tuple(_compile_rule(r) for r in data.get("base_therapy", []))
+    return data
+
+
+def _lookup(words: list[str], start: int) -> tuple[str | None, int]:
+    """Return substance starting at ``words[start]`` and number of words it spans."""
+    for count in range(min(_max_words, len(words) - start), 0, -1):
+        phrase = " ".join(words[start:start + count])
+        key = _synonyms.get(phrase)
+        if key is not None and (len(phrase) >= MIN_STEM_LENGTH or start == 0):
+            return key, count
+    word = words[start]
+    for end in range(len(word) - 1, MIN_STEM_LENGTH - 1, -1):
+        key = _synonyms.get(word[:end])
+        if key is not None:
+            return key, 1
+    return None, 1
+
+
+def find_substances(text: str) -> list[str]:
+    """Return distinct substances mentioned in text (names, synonyms or their stems)."""
+    found: list[str] = []
+    for part in ITEM_SPLIT_RE.split(text.lower()):
+        words = WORD_RE.findall(part)
+        pos = 0
+        while pos < len(words):
+            key, count = _lookup(words, pos)
+            if key is not None and key not in found:
+                found.append(key)
+            pos += count
+    return found
+
+
+def parse_dose(text: str) -> float | None:
+    """Return first number found in dose text or ``None``."""
+    match = DOSE_RE.search(text.replace(",", "."))
+    return float(match.group()) if match else None
+
+
+def hours_since(exposure: str, now: datetime | None = None) -> float | None:
+    """Return hours elapsed since exposure time ``HH:MM`` (within the last day)."""
+    match = TIME_RE.match(exposure)
+    if not match:
+        return None
+    hour, minute = int(match.group(1)), int(match.group(2))
+    if hour > 23 or minute > 59:
+        return None
+    now = now or datetime.now()
+    diff = (now.hour * 60 + now.minute) - (hour * 60 + minute)
+    if diff < 0:
+        if -diff <= FUTURE_TOLERANCE_MINUTES:
+            return None
+        diff += 24 * 60
+    return diff / 60
+
+
+def _applies(rule: dict, dose: float | None, hours: float | None, symptoms: str) -> bool:
+    if rule["dose_above"] is not None and (dose is None or dose <= rule["dose_above"]):
+        return False
+    # time windows are only enforced when the exposure time is known
+    if hours is not None:
+        if rule["min_hours"] is not None and hours < rule["min_hours"]:
+            return False
+        if rule["max_hours"] is not None and hours > rule["max_hours"]:
+            return False
+    if rule["matcher"] is not None and not rule["matcher"].search(symptoms):
+        return False
+    return True
+
+
+def evaluate(
+    substance: str,
+    dose: str = "",
+    exposure_time: str = "",
+    symptoms: str = "",
+    now: datetime | None = None,
+) -> tuple[list[str], list[str]]:
+    """Return interpretation messages and recommended therapy for given exposure."""
+    dose_val = parse_dose(dose)
+    hours = hours_since(exposure_time, now)
+    symptoms = symptoms.lower()
+
+    msgs: list[str] = []
+    therapy: list[str] = []
+    for key in find_substances(substance):
+        for rule in _substances[key]:
+            if _applies(rule, dose_val, hours, symptoms):
+                if rule["message"]:
+                    msgs.append(rule["message"])
+                if rule["therapy"]:
+                    therapy.append(rule["therapy"])
+    therapy.extend(rule["therapy"] for rule in _base_therapy if _applies(rule, dose_val, hours, symptoms))
+    return msgs, therapy
+
+
+def evaluate_records(records, now: datetime | None = None) -> list[tuple[list[str], list[str]]]:
+    """Evaluate iterable of dicts with keys ``substance``, ``dose``, ``time`` and ``symptoms``."""
+    now = now or datetime.now()
+    return [
+        evaluate(
+            rec.get("substance", ""),
+            rec.get("dose", ""),
+            rec.get("time", ""),
+            rec.get("symptoms", ""),
+            now,
+        )
+        for rec in records
+    ]
+
+
+def main(argv: list[str]) -> int:
+    if len(argv) < 3:
+        print(f"Použití: {argv[0]} PRAVIDLA.json PŘÍPADY.csv")
+        return 1
+    load_toxicology_data(argv[1])
+    with open(argv[2], newline="", encoding="utf-8") as fh:
+        records = list(csv.DictReader(fh))
+    for rec, (msgs, therapy) in zip(records, evaluate_records(records)):
+        print(f"{rec.get('substance', '')}: {'; '.join(msgs) or '-'} | {', '.join(therapy)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))